@@ -0,0 +1,88 @@
+"""
+Benchmark: database size and query latency before and after archiving
+10 years of synthetic daily habit events.
+
+Run from the project root:
+    python benchmarks/bench_archive.py
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from db.database import (
+    get_db,
+    initialize_db,
+    insert_habit,
+    log_event,
+    count_habit_events,
+    count_all_time_streak,
+    archive_events,
+)
+
+HABITS = 20
+YEARS = 10
+QUERY_ROUNDS = 20
+
+
+def populate(db):
+    """
+    Insert HABITS habits with one event per day for YEARS years through
+    log_event, so the change log and summaries are written as in the app.
+    """
+    db.execute("PRAGMA synchronous = OFF")  # Only speeds up the setup
+    today = date.today()
+    for i in range(HABITS):
+        insert_habit(db, f"habit-{i}", "synthetic", "daily")
+    for offset in range(YEARS * 365 - 1, -1, -1):
+        day = (today - timedelta(days=offset)).isoformat()
+        for i in range(HABITS):
+            log_event(db, f"habit-{i}", day)
+
+
+def db_size(db, path):
+    """Return the on-disk size of the database after compaction."""
+    db.execute("VACUUM")
+    return os.path.getsize(path)
+
+
+def query_latency(db):
+    """Return the mean latency in ms of the streak queries for all habits."""
+    start = time.perf_counter()
+    for _ in range(QUERY_ROUNDS):
+        for i in range(HABITS):
+            count_all_time_streak(db, f"habit-{i}")
+            count_habit_events(db, f"habit-{i}", "weekly")
+            count_habit_events(db, f"habit-{i}", "monthly")
+    return (time.perf_counter() - start) * 1000 / (QUERY_ROUNDS * HABITS)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        initialize_db(path)
+        db = get_db(path)
+        populate(db)
+
+        size_before = db_size(db, path)
+        latency_before = query_latency(db)
+
+        start = time.perf_counter()
+        archived = archive_events(db)
+        archive_time = time.perf_counter() - start
+
+        size_after = db_size(db, path)
+        latency_after = query_latency(db)
+        db.close()
+
+    print(f"Events: {HABITS} habits x {YEARS} years ({HABITS * YEARS * 365} rows)")
+    print(f"Archived {archived} rows in {archive_time:.2f}s")
+    print(f"Database size:  {size_before / 1024:10.1f} KiB -> {size_after / 1024:10.1f} KiB")
+    print(f"Query latency:  {latency_before:10.3f} ms  -> {latency_after:10.3f} ms (per habit)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: cold-start-to-first-render time of the home screen, comparing
+per-habit streak queries against the precomputed dashboard summary.
+
+Run from the project root:
+    python benchmarks/bench_startup.py
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from data_manager.manager import DataManager
+from db.database import get_db, initialize_db, insert_habit
+
+HABITS = 50
+DAYS = 365
+ROUNDS = 20
+
+
+def populate(path):
+    """Create HABITS habits with one event per day for DAYS days."""
+    initialize_db(path)
+    db = get_db(path)
+    today = date.today()
+    for i in range(HABITS):
+        insert_habit(db, f"habit-{i}", "synthetic", "daily")
+    rows = [
+        (f"habit-{i}", (today - timedelta(days=offset)).isoformat())
+        for i in range(HABITS)
+        for offset in range(DAYS)
+    ]
+    db.executemany("INSERT INTO habit_events (habit_name, date) VALUES (?, ?)", rows)
+    db.execute("PRAGMA user_version = 0")  # Force the summaries to be rebuilt
+    db.commit()
+    db.close()
+
+
+def render_per_habit(manager):
+    """The home screen built from one streak query per habit."""
+    return [
+        (habit.name, manager.calculate_streak(habit.name, habit.schedule), manager.calculate_all_time_streak(habit.name))
+        for habit in manager.get_habits()
+    ]
+
+
+def render_dashboard(manager):
+    """The home screen built from the precomputed summary."""
+    return [(s.habit.name, s.current_streak, s.all_time_count) for s in manager.get_dashboard()]
+
+
+def cold_start(path, render):
+    """Return the mean ms from startup to first render over ROUNDS fresh connections."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        initialize_db(path)
+        manager = DataManager(get_db(path))
+        render(manager)
+        manager.db.close()
+    return (time.perf_counter() - start) * 1000 / ROUNDS
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        populate(path)
+
+        start = time.perf_counter()
+        initialize_db(path)
+        migration = (time.perf_counter() - start) * 1000
+
+        per_habit = cold_start(path, render_per_habit)
+        dashboard = cold_start(path, render_dashboard)
+
+    print(f"Data: {HABITS} habits x {DAYS} days ({HABITS * DAYS} events)")
+    print(f"Schema setup and summary backfill (once): {migration:8.2f} ms")
+    print(f"Cold start to first render, per-habit:    {per_habit:8.2f} ms")
+    print(f"Cold start to first render, dashboard:    {dashboard:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
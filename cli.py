@@ -6,6 +6,16 @@ from controller.habit_controller import HabitController
 from datetime import datetime
 
 
+def _is_positive_number(value):
+    """
+    Check whether a text answer is a number greater than zero.
+    """
+    try:
+        return float(value) > 0
+    except ValueError:
+        return False
+
+
 def cli():
     """
     Command-line interface (CLI) for managing habits, tracking progress,
@@ -50,7 +60,12 @@ def cli():
                     "Set the schedule for the habit:",
                     choices=["daily", "weekly", "monthly"]
                 ).ask()
-                controller.add_habit(name, description, schedule)  # Add the new habit.
+                target = questionary.text(
+                    "Enter a target per period, e.g. 8 (leave blank for none):",
+                    validate=lambda value: not value or _is_positive_number(value)
+                ).ask()
+                # Add the new habit.
+                controller.add_habit(name, description, schedule, float(target) if target else None)
 
             elif choice == "Edit Habit":
                 # Edit an existing habit.
@@ -88,6 +103,7 @@ def cli():
                 "Mark Habit as Done",
                 "Show Streaks",
                 "Show All-Time Streaks",
+                "Show Progress",
                 "Back to Main Menu"
             ]
             # Prompt the user to select a tracking option.
@@ -103,7 +119,11 @@ def cli():
                     "Choose a habit you've completed:",
                     choices=[h.name for h in habits]
                 ).ask()
-                controller.mark_done(habit_name)  # Mark the selected habit as done.
+                quantity = questionary.text(
+                    "How much did you do? (leave blank for 1):",
+                    validate=lambda value: not value or _is_positive_number(value)
+                ).ask()
+                controller.mark_done(habit_name, float(quantity) if quantity else 1)  # Mark the habit as done.
 
             elif tracking_choice == "Show Streaks":
                 # Display streaks for habits based on their schedule.
@@ -116,24 +136,39 @@ def cli():
 
             elif tracking_choice == "Show All-Time Streaks":
                 # Display all-time streak statistics for all habits.
+                for summary in controller.get_dashboard():
+                    habit = summary.habit
+                    print(f"{habit.name}: done on {summary.all_time_count} day(s) ({habit.schedule}).")
+
+            elif tracking_choice == "Show Progress":
+                # Display progress versus target per period for a habit.
                 habits = controller.get_all_habits()
-                for habit in habits:
-                    all_time_streak = controller.calculate_all_time_streak(habit.name)
-                    print(f"{habit.name}: {all_time_streak} events logged ({habit.schedule}).")
+                if not habits:
+                    print("No habits available.")  # Inform if no habits exist.
+                    continue
+                habit_name = questionary.select("Choose a habit:", choices=[h.name for h in habits]).ask()
+                for period, total, target in controller.get_progress(habit_name):
+                    goal = f" / {target:g} ({total / target:.0%})" if target else ""
+                    print(f"{period}: {total:g}{goal}")
 
         elif section_choice == "Viewing Data":
             # Display a detailed overview of all habits.
-            habits = controller.get_all_habits()
-            if not habits:
+            summaries = controller.get_dashboard()
+            if not summaries:
                 print("No habits available.")  # Inform if no habits exist.
                 continue
-            for habit in habits:
-                # Format and display details such as name, description, and creation date.
+            for summary in summaries:
+                # Format and display details such as name, description, creation date, and progress.
+                habit = summary.habit
                 created_at = datetime.fromisoformat(habit.created_at).strftime("%Y-%m-%d %H:%M")
                 print(f"\nName: {habit.name}")
                 print(f"Description: {habit.description}")
                 print(f"Schedule: {habit.schedule}")
                 print(f"Created At: {created_at}")
+                print(f"Current Streak: {summary.current_streak}")
+                print(f"All-Time Count: {summary.all_time_count}")
+                print(f"Last Done: {summary.last_done or 'never'}")
+                print(f"Due: {'yes' if summary.due else 'no'}")
 
         elif section_choice == "Exit":
             # Exit the application gracefully.
@@ -24,7 +24,7 @@ class HabitController:
         """
         return (arg.strip() if isinstance(arg, str) else arg for arg in args)
 
-    def add_habit(self, name, description, schedule):
+    def add_habit(self, name, description, schedule, target=None):
         """
         Add a new habit to the system.
 
@@ -32,10 +32,11 @@ class HabitController:
             name (str): Name of the habit.
             description (str): Description of the habit.
             schedule (str): Frequency of the habit.
+            target (float): Optional quantity to reach per period.
         """
         name, description, schedule = self._sanitize_input(name, description, schedule)
         try:
-            habit = Habit(name, description, schedule)
+            habit = Habit(name, description, schedule, target=target)
             self.manager.add_habit(habit)
             print(f"Habit '{name}' added successfully!")
         except ValueError as e:
@@ -105,17 +106,18 @@ class HabitController:
             print(f"Error: {e}")
             return []
 
-    def mark_done(self, habit_name):
+    def mark_done(self, habit_name, quantity=1):
         """
         Mark a habit as completed for today.
 
         Args:
             habit_name (str): Name of the habit to mark as done.
+            quantity (float): How much was done (e.g., 3 glasses).
         """
         habit_name, = self._sanitize_input(habit_name)
         today = date.today().isoformat()
         try:
-            self.manager.log_event(habit_name, today)
+            self.manager.log_event(habit_name, today, quantity)
             print(f"Habit '{habit_name}' marked as done for today!")
         except Exception as e:
             print(f"Error: {e}")
@@ -154,3 +156,33 @@ class HabitController:
         except Exception as e:
             print(f"Error: {e}")
             return 0
+
+    def get_progress(self, habit_name):
+        """
+        Get progress versus target for a habit, per schedule period.
+
+        Args:
+            habit_name (str): Name of the habit.
+
+        Returns:
+            list: (period, total, target) tuples ordered by period.
+        """
+        habit_name, = self._sanitize_input(habit_name)
+        try:
+            return self.manager.get_progress(habit_name)
+        except Exception as e:
+            print(f"Error: {e}")
+            return []
+
+    def get_dashboard(self):
+        """
+        Retrieve every habit with its current streak, all-time count and due status.
+
+        Returns:
+            list: HabitSummary objects for all habits.
+        """
+        try:
+            return self.manager.get_dashboard()
+        except Exception as e:
+            print(f"Error: {e}")
+            return []
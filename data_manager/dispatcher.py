@@ -0,0 +1,138 @@
+import json
+import shlex
+import sqlite3
+import subprocess
+import time
+
+from data_manager.manager import DataManager
+from db.database import get_db
+
+
+class ChangeDispatcher:
+    """
+    Delivers the habit change feed to local subscribers in batches.
+
+    Each subscriber has its own position in the feed. Pending changes are
+    read from the database one batch at a time instead of being queued in
+    memory, so a slow subscriber only falls behind (backpressure). A
+    subscriber that raises keeps its position and gets the same batch again
+    on the next dispatch.
+
+    Every dispatch opens its own connection to the database, so the
+    dispatcher can run on a background thread.
+    """
+
+    def __init__(self, db_name="habits.db", batch_size=100, max_batches=10):
+        """
+        Initializes the dispatcher.
+
+        :param db_name: Path of the database whose change feed is delivered.
+        :param batch_size: Maximum number of changes passed to a subscriber at once.
+        :param max_batches: Maximum number of batches per subscriber per dispatch.
+        """
+        if batch_size <= 0 or max_batches <= 0:
+            raise ValueError("Batch size and batch count must be greater than zero.")
+        self.db_name = db_name
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._subscribers = {}
+
+    def subscribe(self, name, callback, since_seq=0):
+        """
+        Registers a callback that receives lists of Change objects.
+
+        :param name: Unique name of the subscriber.
+        :param callback: Callable taking a list of Change objects.
+        :param since_seq: Sequence number the subscriber has already seen.
+        :raises ValueError: If a subscriber with this name already exists.
+        """
+        if name in self._subscribers:
+            raise ValueError(f"Subscriber '{name}' already exists.")
+        self._subscribers[name] = {"callback": callback, "seq": since_seq}
+
+    def subscribe_script(self, name, command, since_seq=0, timeout=30):
+        """
+        Registers a script that receives each batch as JSON lines on stdin.
+        A non-zero exit status counts as a failed delivery.
+
+        :param name: Unique name of the subscriber.
+        :param command: Command to run, as a list of arguments or a string.
+        :param since_seq: Sequence number the subscriber has already seen.
+        :param timeout: Seconds the script may take per batch.
+        """
+        args = shlex.split(command) if isinstance(command, str) else list(command)
+
+        def run_script(changes):
+            lines = "".join(json.dumps(change.to_dict()) + "\n" for change in changes)
+            subprocess.run(args, input=lines, text=True, check=True, timeout=timeout)
+
+        self.subscribe(name, run_script, since_seq)
+
+    def unsubscribe(self, name):
+        """
+        Removes a subscriber.
+
+        :param name: Name of the subscriber to remove.
+        """
+        self._subscribers.pop(name, None)
+
+    def position(self, name):
+        """
+        Returns the sequence number of the last change delivered to a subscriber.
+
+        :param name: Name of the subscriber.
+        """
+        return self._subscribers[name]["seq"]
+
+    def dispatch(self):
+        """
+        Delivers pending changes to every subscriber, up to max_batches batches each.
+
+        :return: The number of changes delivered.
+        """
+        manager = DataManager(get_db(self.db_name))
+        try:
+            return self._deliver(manager)
+        finally:
+            manager.db.close()
+
+    def _deliver(self, manager):
+        """
+        Delivers pending changes read through the given DataManager.
+        """
+        delivered = 0
+        for name, subscriber in list(self._subscribers.items()):
+            for _ in range(self.max_batches):
+                changes = manager.changes_since(subscriber["seq"], self.batch_size)
+                if not changes:
+                    break
+                try:
+                    subscriber["callback"](changes)
+                except Exception as e:
+                    print(f"Error: Subscriber '{name}' failed: {e}")
+                    break
+                subscriber["seq"] = changes[-1].seq
+                delivered += len(changes)
+                if len(changes) < self.batch_size:
+                    break
+        return delivered
+
+    def run(self, poll_interval=1.0, stop_event=None):
+        """
+        Dispatches changes until stop_event is set, sleeping when the feed is idle.
+        Database errors are reported and retried on the next poll.
+
+        :param poll_interval: Seconds to wait between polls when nothing was delivered.
+        :param stop_event: Optional threading.Event that ends the loop.
+        """
+        while stop_event is None or not stop_event.is_set():
+            try:
+                delivered = self.dispatch()
+            except sqlite3.Error as e:
+                print(f"Error: Could not read the change feed: {e}")
+                delivered = 0
+            if not delivered:
+                if stop_event is None:
+                    time.sleep(poll_interval)
+                else:
+                    stop_event.wait(poll_interval)
@@ -5,12 +5,22 @@ from db.database import (
     delete_habit,
     clear_all_habits,
     fetch_habits,
+    fetch_habit,
     fetch_habits_by_schedule,
     log_event,
     count_habit_events,
     count_all_time_streak,
+    fetch_progress,
+    fetch_changes,
+    prune_changes,
+    fetch_dashboard,
+    PERIOD_KEYS,
+    archive_events,
+    ARCHIVE_HORIZON_DAYS,
 )
+from models.change import Change
 from models.habit import Habit
+from models.summary import HabitSummary
 
 
 class DataManager:
@@ -32,10 +42,13 @@ class DataManager:
         Adds a new habit to the database.
 
         :param habit: An instance of the Habit class representing the habit.
-        :raises ValueError: If the habit name is empty or a duplicate already exists.
+        :raises ValueError: If the habit name is empty, the target is not positive,
+            or a duplicate already exists.
         """
         if not habit.name.strip():
             raise ValueError("Habit name cannot be empty.")
+        if habit.target is not None and habit.target <= 0:
+            raise ValueError("Habit target must be greater than zero.")
 
         # Check for duplicates in the database
         existing_habits = fetch_habits(self.db)
@@ -44,9 +57,9 @@ class DataManager:
             raise ValueError(f"Habit '{habit.name}' already exists.")
 
         # Insert the habit into the database
-        insert_habit(self.db, habit.name.strip(), habit.description.strip(), habit.schedule.strip())
+        insert_habit(self.db, habit.name.strip(), habit.description.strip(), habit.schedule.strip(), habit.target)
 
-    def edit_habit(self, old_name, new_name, new_description, new_schedule):
+    def edit_habit(self, old_name, new_name, new_description, new_schedule, new_target=None):
         """
         Updates an existing habit in the database.
 
@@ -54,8 +67,14 @@ class DataManager:
         :param new_name: Updated name for the habit.
         :param new_description: Updated description for the habit.
         :param new_schedule: Updated schedule for the habit.
+        :param new_target: Optional updated target; the current target is kept if None.
+        :raises ValueError: If the new target is not positive.
         """
-        edit_habit(self.db, old_name.strip(), new_name.strip(), new_description.strip(), new_schedule.strip())
+        if new_target is not None and new_target <= 0:
+            raise ValueError("Habit target must be greater than zero.")
+        edit_habit(
+            self.db, old_name.strip(), new_name.strip(), new_description.strip(), new_schedule.strip(), new_target
+        )
 
     def delete_habit(self, name):
         """
@@ -90,14 +109,18 @@ class DataManager:
         rows = fetch_habits_by_schedule(self.db, schedule.strip())
         return [Habit(*row) for row in rows]
 
-    def log_event(self, habit_name, event_date):
+    def log_event(self, habit_name, event_date, quantity=1):
         """
         Logs a habit completion event.
 
         :param habit_name: Name of the habit to log the event for.
         :param event_date: The date the event occurred (ISO format).
+        :param quantity: How much was done (e.g., 3 glasses); defaults to 1.
+        :raises ValueError: If the quantity is not positive.
         """
-        log_event(self.db, habit_name.strip(), event_date)
+        if quantity <= 0:
+            raise ValueError("Quantity must be greater than zero.")
+        log_event(self.db, habit_name.strip(), event_date, quantity)
 
     def calculate_streak(self, habit_name, streak_type):
         """
@@ -117,3 +140,61 @@ class DataManager:
         :return: The longest streak count.
         """
         return count_all_time_streak(self.db, habit_name.strip())
+
+    def get_progress(self, habit_name, period=None, since=None):
+        """
+        Reports progress versus target for a habit, per period.
+
+        :param habit_name: Name of the habit.
+        :param period: "daily", "weekly" or "monthly"; defaults to the habit's schedule.
+        :param since: Optional ISO date; only events on or after it are included.
+        :return: A list of (period, total, target) tuples ordered by period.
+        :raises ValueError: If the habit does not exist or the period is unknown.
+        """
+        row = fetch_habit(self.db, habit_name.strip())
+        if row is None:
+            raise ValueError(f"Habit '{habit_name}' does not exist.")
+        habit = Habit(*row)
+        period = (period or habit.schedule).strip().lower()
+        if period not in PERIOD_KEYS:
+            raise ValueError(f"Unknown period '{period}'.")
+        totals = fetch_progress(self.db, habit.name, period, since)
+        return [(key, total, habit.target) for key, total in totals]
+
+    def archive_old_events(self, horizon_days=ARCHIVE_HORIZON_DAYS):
+        """
+        Moves events older than the horizon into the compact archive.
+
+        :param horizon_days: Events older than this many days are archived.
+        :return: The number of event rows archived.
+        """
+        return archive_events(self.db, horizon_days)
+
+    def changes_since(self, seq, limit=None):
+        """
+        Retrieves the habit changes recorded after a sequence number.
+
+        :param seq: Sequence number of the last change already seen (0 for all).
+        :param limit: Optional maximum number of changes to return.
+        :return: A list of Change objects ordered by sequence number.
+        """
+        rows = fetch_changes(self.db, seq, limit)
+        return [Change(*row) for row in rows]
+
+    def get_dashboard(self):
+        """
+        Retrieves every habit with its precomputed summary in a single query.
+
+        :return: A list of HabitSummary objects.
+        """
+        rows = fetch_dashboard(self.db)
+        return [HabitSummary(Habit(*row[:5]), *row[5:]) for row in rows]
+
+    def prune_changes(self, before_seq):
+        """
+        Deletes the changes that every consumer has already read.
+
+        :param before_seq: Changes with a lower sequence number are deleted.
+        :return: The number of changes deleted.
+        """
+        return prune_changes(self.db, before_seq)
@@ -1,5 +1,21 @@
+import json
 import sqlite3
-from datetime import datetime
+import struct
+from datetime import date, datetime, timedelta
+
+# Events older than this many days are moved into the compact archive.
+ARCHIVE_HORIZON_DAYS = 365
+
+# Bump whenever the DDL in initialize_db changes.
+SCHEMA_VERSION = 1
+
+# SQL expressions labelling the progress period of an event; weeks are
+# labelled by their Monday so a week spanning New Year stays one period.
+PERIOD_KEYS = {
+    "daily": "DATE(date)",
+    "weekly": "DATE(date, '-6 days', 'weekday 1')",
+    "monthly": "strftime('%Y-%m', date)",
+}
 
 
 def get_db(db_name="habits.db"):
@@ -9,13 +25,19 @@ def get_db(db_name="habits.db"):
     return sqlite3.connect(db_name)
 
 
-def initialize_db():
+def initialize_db(db_name="habits.db"):
     """
-    Initialize the required database tables.
+    Initialize the required database tables. Does nothing if the stored
+    schema version is already current.
     """
-    conn = get_db()
+    conn = get_db(db_name)
     cursor = conn.cursor()
 
+    cursor.execute("PRAGMA user_version")
+    if cursor.fetchone()[0] == SCHEMA_VERSION:
+        conn.close()
+        return
+
     # Create the habits table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS habits (
@@ -23,7 +45,8 @@ def initialize_db():
             name TEXT NOT NULL UNIQUE,
             description TEXT,
             schedule TEXT NOT NULL,
-            created_at TEXT NOT NULL
+            created_at TEXT NOT NULL,
+            target REAL
         );
     """)
 
@@ -33,15 +56,79 @@ def initialize_db():
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             habit_name TEXT NOT NULL,
             date TEXT NOT NULL,
+            quantity REAL NOT NULL DEFAULT 1,
+            FOREIGN KEY (habit_name) REFERENCES habits (name)
+        );
+    """)
+
+    # Add the columns introduced after the first release to existing databases
+    _add_column_if_missing(cursor, "habits", "target", "REAL")
+    _add_column_if_missing(cursor, "habit_events", "quantity", "REAL NOT NULL DEFAULT 1")
+
+    # Index events by habit and date, covering quantity for the progress sums
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_habit_events_progress
+        ON habit_events (habit_name, date, quantity);
+    """)
+
+    # Create the archive table: one bit per day, starting at start_date, and
+    # the run-length encoded quantity of each set day
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS habit_archive (
+            habit_name TEXT PRIMARY KEY,
+            start_date TEXT NOT NULL,
+            days BLOB NOT NULL,
+            quantities BLOB NOT NULL,
             FOREIGN KEY (habit_name) REFERENCES habits (name)
         );
     """)
 
+    # Create the change log: one row per mutation, in commit order
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS habit_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            operation TEXT NOT NULL,
+            habit_name TEXT,
+            payload TEXT NOT NULL,
+            changed_at TEXT NOT NULL
+        );
+    """)
+
+    # Create the dashboard summary table, maintained on each write.
+    # current_streak counts consecutive schedule periods ending at last_done;
+    # it is still current until streak_until, and the habit is due from due_from.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS habit_summary (
+            habit_name TEXT PRIMARY KEY,
+            current_streak INTEGER NOT NULL DEFAULT 0,
+            all_time_count INTEGER NOT NULL DEFAULT 0,
+            last_done TEXT,
+            due_from TEXT,
+            streak_until TEXT,
+            FOREIGN KEY (habit_name) REFERENCES habits (name)
+        );
+    """)
+
+    # Build summaries for habits created before the summary table existed
+    cursor.execute("SELECT name FROM habits")
+    for (name,) in cursor.fetchall():
+        _refresh_summary(cursor, name)
+
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
     conn.close()
 
 
-def insert_habit(db, name, description, schedule):
+def _add_column_if_missing(cursor, table, column, definition):
+    """
+    Add a column to an existing table if it is not there yet.
+    """
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in (row[1] for row in cursor.fetchall()):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def insert_habit(db, name, description, schedule, target=None):
     """
     Insert a new habit into the habits table.
     """
@@ -49,24 +136,36 @@ def insert_habit(db, name, description, schedule):
     created_at = datetime.now().isoformat()
     try:
         cursor.execute(
-            "INSERT INTO habits (name, description, schedule, created_at) VALUES (?, ?, ?, ?)",
-            (name, description, schedule, created_at)
+            "INSERT INTO habits (name, description, schedule, created_at, target) VALUES (?, ?, ?, ?, ?)",
+            (name, description, schedule, created_at, target)
         )
+        _record_change(
+            cursor, "insert", name,
+            description=description, schedule=schedule, created_at=created_at, target=target
+        )
+        _refresh_summary(cursor, name)
     except sqlite3.IntegrityError:
         print(f"Error: The habit '{name}' already exists!")
     db.commit()
 
 
-def edit_habit(db, old_name, new_name, new_description, new_schedule):
+def edit_habit(db, old_name, new_name, new_description, new_schedule, new_target=None):
     """
-    Edit an existing habit's name, description, and schedule.
+    Edit an existing habit's name, description, schedule, and (if given) target.
     """
     cursor = db.cursor()
     cursor.execute("""
         UPDATE habits
-        SET name = ?, description = ?, schedule = ?
+        SET name = ?, description = ?, schedule = ?, target = COALESCE(?, target)
         WHERE name = ?
-    """, (new_name, new_description, new_schedule, old_name))
+    """, (new_name, new_description, new_schedule, new_target, old_name))
+    if cursor.rowcount:
+        _record_change(
+            cursor, "edit", old_name,
+            new_name=new_name, description=new_description, schedule=new_schedule, target=new_target
+        )
+        cursor.execute("DELETE FROM habit_summary WHERE habit_name = ?", (old_name,))
+        _refresh_summary(cursor, new_name)
     db.commit()
 
 
@@ -76,7 +175,12 @@ def delete_habit(db, name):
     """
     cursor = db.cursor()
     cursor.execute("DELETE FROM habits WHERE name = ?", (name,))
+    deleted = cursor.rowcount
     cursor.execute("DELETE FROM habit_events WHERE habit_name = ?", (name,))
+    cursor.execute("DELETE FROM habit_archive WHERE habit_name = ?", (name,))
+    cursor.execute("DELETE FROM habit_summary WHERE habit_name = ?", (name,))
+    if deleted:
+        _record_change(cursor, "delete", name)
     db.commit()
 
 
@@ -87,6 +191,9 @@ def clear_all_habits(db):
     cursor = db.cursor()
     cursor.execute("DELETE FROM habits")
     cursor.execute("DELETE FROM habit_events")
+    cursor.execute("DELETE FROM habit_archive")
+    cursor.execute("DELETE FROM habit_summary")
+    _record_change(cursor, "clear", None)
     db.commit()
 
 
@@ -95,61 +202,424 @@ def fetch_habits(db):
     Get all habits from the database.
     """
     cursor = db.cursor()
-    cursor.execute("SELECT name, description, schedule, created_at FROM habits")
+    cursor.execute("SELECT name, description, schedule, created_at, target FROM habits")
     return cursor.fetchall()
 
 
+def fetch_habit(db, name):
+    """
+    Get a single habit by name, or None if it does not exist.
+    """
+    cursor = db.cursor()
+    cursor.execute("SELECT name, description, schedule, created_at, target FROM habits WHERE name = ?", (name,))
+    return cursor.fetchone()
+
+
 def fetch_habits_by_schedule(db, schedule):
     """
     Get habits filtered by their schedule (daily, weekly, or monthly).
     """
     cursor = db.cursor()
-    cursor.execute("SELECT name, description, schedule, created_at FROM habits WHERE schedule = ?", (schedule,))
+    cursor.execute(
+        "SELECT name, description, schedule, created_at, target FROM habits WHERE schedule = ?", (schedule,)
+    )
     return cursor.fetchall()
 
 
-def log_event(db, habit_name, date):
+def log_event(db, habit_name, date, quantity=1):
     """
-    Log a habit completion event.
+    Log a habit completion event, optionally with a quantity (e.g. 3 glasses).
+    The date is validated before anything is written.
     """
+    day = _parse_day(date)
+    date = str(date)
     cursor = db.cursor()
-    cursor.execute("INSERT INTO habit_events (habit_name, date) VALUES (?, ?)", (habit_name, date))
+    cursor.execute(
+        "INSERT INTO habit_events (habit_name, date, quantity) VALUES (?, ?, ?)",
+        (habit_name, date, quantity)
+    )
+    _record_change(cursor, "log_event", habit_name, date=date, quantity=quantity)
+    _update_summary_for_event(cursor, habit_name, day)
     db.commit()
 
 
-def count_habit_events(db, habit_name, streak_type):
+def _parse_day(value):
     """
-    Count habit events for streaks (daily, weekly, monthly).
+    Get the day of an ISO date, date or datetime value.
+    Raises ValueError if the value is not one.
+    """
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        raise ValueError(f"Invalid event date '{value}', expected YYYY-MM-DD.") from None
+
+
+def fetch_dashboard(db, today=None):
+    """
+    Get every habit together with its precomputed summary in a single query.
+    Rows are (name, description, schedule, created_at, target,
+    current_streak, all_time_count, last_done, due).
+    """
+    today = today or date.today().isoformat()
+    cursor = db.cursor()
+    cursor.execute("""
+        SELECT h.name, h.description, h.schedule, h.created_at, h.target,
+               CASE WHEN s.streak_until >= ? THEN s.current_streak ELSE 0 END,
+               COALESCE(s.all_time_count, 0),
+               s.last_done,
+               s.last_done IS NULL OR s.due_from <= ?
+        FROM habits h
+        LEFT JOIN habit_summary s ON s.habit_name = h.name
+        ORDER BY h.id;
+    """, (today, today))
+    return cursor.fetchall()
+
+
+def fetch_changes(db, since_seq, limit=None):
+    """
+    Get the changes recorded after `since_seq`, oldest first, at most `limit` of them.
+    """
+    cursor = db.cursor()
+    cursor.execute("""
+        SELECT seq, operation, habit_name, payload, changed_at FROM habit_changes
+        WHERE seq > ?
+        ORDER BY seq
+        LIMIT ?;
+    """, (since_seq, -1 if limit is None else limit))
+    return cursor.fetchall()
+
+
+def prune_changes(db, before_seq):
+    """
+    Delete the changes with a sequence number below `before_seq`.
+    Returns the number of changes deleted.
     """
     cursor = db.cursor()
+    cursor.execute("DELETE FROM habit_changes WHERE seq < ?", (before_seq,))
+    db.commit()
+    return cursor.rowcount
 
-    if streak_type == "daily":
-        cursor.execute("""
-            SELECT COUNT(*) FROM habit_events 
-            WHERE habit_name = ? AND date = DATE('now');
-        """, (habit_name,))
-    elif streak_type == "weekly":
-        cursor.execute("""
-            SELECT COUNT(*) FROM habit_events 
-            WHERE habit_name = ? AND date >= DATE('now', '-7 days');
-        """, (habit_name,))
-    elif streak_type == "monthly":
-        cursor.execute("""
-            SELECT COUNT(*) FROM habit_events 
-            WHERE habit_name = ? AND date >= DATE('now', '-30 days');
-        """, (habit_name,))
-
-    result = cursor.fetchone()
-    return result[0] if result else 0
+
+def _record_change(cursor, operation, habit_name, **payload):
+    """
+    Append a change to the change log. Callers commit it together with the
+    mutation it describes, so the log never disagrees with the data.
+    """
+    cursor.execute(
+        "INSERT INTO habit_changes (operation, habit_name, payload, changed_at) VALUES (?, ?, ?, ?)",
+        (operation, habit_name, json.dumps(payload), datetime.now().isoformat())
+    )
+
+
+def count_habit_events(db, habit_name, streak_type):
+    """
+    Count the days a habit was done for streaks (daily, weekly, monthly),
+    up to and including today. Archived days are included.
+    """
+    windows = {"daily": 0, "weekly": 7, "monthly": 30}
+    if streak_type not in windows:
+        return 0
+
+    # Use the local date, the same one mark_done logs events with
+    today = date.today()
+    since = (today - timedelta(days=windows[streak_type])).isoformat()
+    return _count_done_days(db.cursor(), habit_name, since, today.isoformat())
 
 
 def count_all_time_streak(db, habit_name):
     """
-    Count the total number of logged events for a habit (all-time streak).
+    Count the total number of days a habit was done (all-time streak),
+    across both the habit_events table and the archive.
+    """
+    return _count_done_days(db.cursor(), habit_name)
+
+
+def fetch_progress(db, habit_name, period, since=None):
+    """
+    Sum the logged quantities of a habit per period (daily, weekly, monthly),
+    optionally only for events on or after `since`. Archived days are included.
+    Returns a list of (period, total) tuples ordered by period.
     """
     cursor = db.cursor()
+    cursor.execute(f"""
+        SELECT {PERIOD_KEYS[period]} AS period, SUM(quantity) FROM habit_events
+        WHERE habit_name = ? AND date >= ?
+        GROUP BY period;
+    """, (habit_name, since or ""))
+    totals = dict(cursor.fetchall())
+
+    archived = _fetch_archive(cursor, habit_name)
+    if archived:
+        for day, quantity in _decode_archive(*archived).items():
+            if since is None or day.isoformat() >= since:
+                key = _period_key(day, period)
+                totals[key] = totals.get(key, 0) + quantity
+
+    return sorted(totals.items())
+
+
+def _period_key(day, period):
+    """
+    Label the progress period containing a date, matching PERIOD_KEYS.
+    """
+    if period == "weekly":
+        return (day - timedelta(days=day.weekday())).isoformat()
+    if period == "monthly":
+        return day.strftime("%Y-%m")
+    return day.isoformat()
+
+
+def archive_events(db, horizon_days=ARCHIVE_HORIZON_DAYS):
+    """
+    Move habit events older than the horizon out of habit_events and into
+    the per-habit archive, keeping each day's total quantity, and drop their
+    log_event entries from the change log. Returns the number of event rows archived.
+    """
+    if horizon_days < 0:
+        raise ValueError("Archive horizon cannot be negative.")
+
+    cursor = db.cursor()
+    cutoff = (date.today() - timedelta(days=horizon_days)).isoformat()
+    cursor.execute("""
+        SELECT habit_name, DATE(date) AS day, SUM(quantity) FROM habit_events
+        WHERE date < ?
+        GROUP BY habit_name, day;
+    """, (cutoff,))
+
+    old_days = {}
+    for habit_name, day, quantity in cursor.fetchall():
+        old_days.setdefault(habit_name, {})[date.fromisoformat(day)] = quantity
+
+    for habit_name, days in old_days.items():
+        archived = _fetch_archive(cursor, habit_name)
+        if archived:
+            for day, quantity in _decode_archive(*archived).items():
+                days[day] = days.get(day, 0) + quantity
+        cursor.execute(
+            "INSERT OR REPLACE INTO habit_archive (habit_name, start_date, days, quantities) VALUES (?, ?, ?, ?)",
+            (habit_name, *_encode_archive(days))
+        )
+
+    cursor.execute("DELETE FROM habit_events WHERE date < ?", (cutoff,))
+    archived_rows = cursor.rowcount
+
+    # The log_event changes of archived events are compacted away with them
+    cursor.execute("""
+        DELETE FROM habit_changes
+        WHERE operation = 'log_event' AND json_extract(payload, '$.date') < ?;
+    """, (cutoff,))
+    db.commit()
+    return archived_rows
+
+
+def _fetch_archive(cursor, habit_name):
+    """
+    Get the (start_date, days, quantities) archive row for a habit, or None.
+    """
+    cursor.execute("SELECT start_date, days, quantities FROM habit_archive WHERE habit_name = ?", (habit_name,))
+    return cursor.fetchone()
+
+
+def _encode_archive(day_quantities):
+    """
+    Pack a {date: quantity} mapping into a start date, a bitset with one bit
+    per day, and the run-length encoded quantities of the set days in order.
+    Each run is a varint count followed by the quantity as a little-endian double.
+    """
+    start = min(day_quantities)
+    bits = 0
+    runs = bytearray()
+    previous, count = None, 0
+    for day in sorted(day_quantities):
+        bits |= 1 << (day - start).days
+        quantity = float(day_quantities[day])
+        if quantity == previous:
+            count += 1
+            continue
+        if count:
+            runs += _encode_run(count, previous)
+        previous, count = quantity, 1
+    runs += _encode_run(count, previous)
+    return start.isoformat(), bits.to_bytes((bits.bit_length() + 7) // 8, "little"), bytes(runs)
+
+
+def _encode_run(count, quantity):
+    """
+    Encode one run of equal quantities as a varint count and a double.
+    """
+    run = bytearray()
+    while count > 0x7F:
+        run.append(count & 0x7F | 0x80)
+        count >>= 7
+    run.append(count)
+    return run + struct.pack("<d", quantity)
+
+
+def _decode_archive(start_date, days, quantities):
+    """
+    Unpack an archive row into a {date: quantity} mapping.
+    """
+    start = date.fromisoformat(start_date)
+    bits = int.from_bytes(days, "little")
+    dates = []
+    offset = 0
+    while bits:
+        if bits & 1:
+            dates.append(start + timedelta(days=offset))
+        bits >>= 1
+        offset += 1
+
+    values = []
+    position = 0
+    while position < len(quantities):
+        count = shift = 0
+        while True:
+            byte = quantities[position]
+            position += 1
+            count |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        values += struct.unpack_from("<d", quantities, position) * count
+        position += 8
+    return dict(zip(dates, values))
+
+
+def _count_done_days(cursor, habit_name, since=None, until=None):
+    """
+    Count the distinct days a habit was done between `since` and `until`
+    (inclusive ISO dates, open-ended if None), across habit_events and the
+    archive. A day present in both is counted once.
+    """
+    where = "habit_name = ?"
+    params = [habit_name]
+    if since:
+        where += " AND date >= ?"
+        params.append(since)
+    if until:
+        where += " AND date < DATE(?, '+1 day')"
+        params.append(until)
+    cursor.execute(f"SELECT COUNT(DISTINCT DATE(date)) FROM habit_events WHERE {where};", params)
+    count = cursor.fetchone()[0]
+
+    archived = _fetch_archive(cursor, habit_name)
+    if not archived:
+        return count
+    start = date.fromisoformat(archived[0])
+    bits = int.from_bytes(archived[1], "little")
+
+    # Keep only the archived bits inside the window
+    low = max((date.fromisoformat(since) - start).days, 0) if since else 0
+    high = (date.fromisoformat(until) - start).days + 1 if until else bits.bit_length()
+    if high <= low:
+        return count
+    count += bin((bits >> low) & ((1 << (high - low)) - 1)).count("1")
+
+    # Days logged again after being archived were counted on both sides
+    archive_end = (start + timedelta(days=bits.bit_length())).isoformat()
+    cursor.execute(
+        f"SELECT DISTINCT DATE(date) FROM habit_events WHERE {where} AND date < ?;",
+        params + [archive_end]
+    )
+    for (day,) in cursor.fetchall():
+        offset = (date.fromisoformat(day) - start).days
+        if offset >= 0 and bits >> offset & 1:
+            count -= 1
+    return count
+
+
+def _period_index(day, schedule):
+    """
+    Number the schedule period (day, Monday-based week, or month) containing a date.
+    """
+    schedule = schedule.strip().lower()
+    if schedule == "weekly":
+        return (day.toordinal() - 1) // 7
+    if schedule == "monthly":
+        return day.year * 12 + day.month - 1
+    return day.toordinal()
+
+
+def _period_start(index, schedule):
+    """
+    Get the first date of a numbered schedule period.
+    """
+    schedule = schedule.strip().lower()
+    if schedule == "weekly":
+        return date.fromordinal(index * 7 + 1)
+    if schedule == "monthly":
+        return date(index // 12, index % 12 + 1, 1)
+    return date.fromordinal(index)
+
+
+def _write_summary(cursor, habit_name, schedule, current_streak, all_time_count, last_done):
+    """
+    Store a habit's summary row, deriving when it becomes due and when its streak lapses.
+    """
+    due_from = streak_until = None
+    if last_done:
+        index = _period_index(last_done, schedule)
+        due_from = _period_start(index + 1, schedule).isoformat()
+        streak_until = (_period_start(index + 2, schedule) - timedelta(days=1)).isoformat()
+        last_done = last_done.isoformat()
     cursor.execute("""
-        SELECT COUNT(*) FROM habit_events WHERE habit_name = ?;
+        INSERT OR REPLACE INTO habit_summary
+        (habit_name, current_streak, all_time_count, last_done, due_from, streak_until)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (habit_name, current_streak, all_time_count, last_done, due_from, streak_until))
+
+
+def _refresh_summary(cursor, habit_name):
+    """
+    Recompute a habit's summary from the habit_events table and the archive.
+    """
+    cursor.execute("SELECT schedule FROM habits WHERE name = ?", (habit_name,))
+    row = cursor.fetchone()
+    if row is None:
+        return
+    schedule = row[0]
+
+    cursor.execute("SELECT DISTINCT date FROM habit_events WHERE habit_name = ?", (habit_name,))
+    days = {date.fromisoformat(day[:10]) for (day,) in cursor.fetchall()}
+    archived = _fetch_archive(cursor, habit_name)
+    if archived:
+        days.update(_decode_archive(*archived))
+
+    streak = 0
+    last_done = max(days) if days else None
+    if last_done:
+        periods = {_period_index(day, schedule) for day in days}
+        index = _period_index(last_done, schedule)
+        while index - streak in periods:
+            streak += 1
+    _write_summary(cursor, habit_name, schedule, streak, len(days), last_done)
+
+
+def _update_summary_for_event(cursor, habit_name, day):
+    """
+    Update a habit's summary for a newly logged event without rescanning its
+    history, unless the event predates the last completion.
+    """
+    cursor.execute("""
+        SELECT h.schedule, s.current_streak, s.all_time_count, s.last_done
+        FROM habits h JOIN habit_summary s ON s.habit_name = h.name
+        WHERE h.name = ?
     """, (habit_name,))
-    result = cursor.fetchone()
-    return result[0] if result else 0
+    row = cursor.fetchone()
+    if row is None:
+        _refresh_summary(cursor, habit_name)
+        return
+
+    schedule, streak, count, last_done = row
+    if last_done is None:
+        streak = 1
+    else:
+        last_done = date.fromisoformat(last_done)
+        if day == last_done:
+            return  # The day is already counted
+        if day < last_done:
+            _refresh_summary(cursor, habit_name)
+            return
+        gap = _period_index(day, schedule) - _period_index(last_done, schedule)
+        streak = streak if gap == 0 else streak + 1 if gap == 1 else 1
+    _write_summary(cursor, habit_name, schedule, streak, count + 1, day)
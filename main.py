@@ -1,11 +1,15 @@
 from cli import cli
-from db.database import initialize_db
+from db.database import get_db, initialize_db, archive_events
 
 if __name__ == "__main__":
     try:
         # Initialize the database
         initialize_db()
+        # Move events older than the archive horizon into the compact archive
+        db = get_db()
+        archive_events(db)
+        db.close()
         # Run the CLI program
         cli()
     except Exception as e:
-        print(f"Database Initialization Error: {e}")
\ No newline at end of file
+        print(f"Database Initialization Error: {e}")
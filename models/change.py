@@ -0,0 +1,32 @@
+import json
+
+
+class Change:
+    def __init__(self, seq: int, operation: str, habit_name: str, payload: str, changed_at: str):
+        """
+        Represents one entry of the habit change log.
+
+        Args:
+            seq (int): Monotonically increasing sequence number of the change.
+            operation (str): Kind of mutation (insert, edit, delete, clear, log_event).
+            habit_name (str): Habit affected by the change, or None for clear.
+            payload (str): JSON-encoded details of the change.
+            changed_at (str): Time the change was recorded.
+        """
+        self.seq = seq
+        self.operation = operation
+        self.habit_name = habit_name
+        self.payload = json.loads(payload) if isinstance(payload, str) else payload
+        self.changed_at = changed_at
+
+    def to_dict(self):
+        """
+        Returns the change as a JSON-serializable dictionary.
+        """
+        return {
+            "seq": self.seq,
+            "operation": self.operation,
+            "habit_name": self.habit_name,
+            "payload": self.payload,
+            "changed_at": self.changed_at,
+        }
@@ -1,5 +1,5 @@
 class Habit:
-    def __init__(self, name: str, description: str, schedule: str, created_at: str = ""):
+    def __init__(self, name: str, description: str, schedule: str, created_at: str = "", target: float = None):
         """
         Represents a Habit instance with basic details.
 
@@ -8,8 +8,10 @@ class Habit:
             description (str): Description of the habit.
             schedule (str): Habit schedule (e.g., daily, weekly).
             created_at (str): Creation date of the habit.
+            target (float): Optional quantity to reach per schedule period (e.g., 8 glasses daily).
         """
         self.name = name.strip()  # Normalize name
         self.description = description.strip()  # Normalize description
         self.schedule = schedule.strip()  # Normalize schedule
         self.created_at = created_at.strip() if created_at else ""  # Normalize created_at
+        self.target = target
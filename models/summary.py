@@ -0,0 +1,20 @@
+from models.habit import Habit
+
+
+class HabitSummary:
+    def __init__(self, habit: Habit, current_streak: int, all_time_count: int, last_done: str, due: bool):
+        """
+        Represents the precomputed dashboard summary of a habit.
+
+        Args:
+            habit (Habit): The summarized habit.
+            current_streak (int): Consecutive schedule periods completed up to now.
+            all_time_count (int): Total number of days the habit was done.
+            last_done (str): Date the habit was last done, or None.
+            due (bool): Whether the habit still has to be done in the current period.
+        """
+        self.habit = habit
+        self.current_streak = current_streak
+        self.all_time_count = all_time_count
+        self.last_done = last_done
+        self.due = bool(due)
@@ -1,14 +1,18 @@
 import sys
 import os
+import threading
+import time
 import pytest
-from datetime import date
+from datetime import date, timedelta
 
 # Add project root to sys.path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 
 # Import modules from your project
 from data_manager.manager import DataManager
+from data_manager.dispatcher import ChangeDispatcher
 from models.habit import Habit
+from db.database import initialize_db
 
 
 # --- Fixtures ---
@@ -18,6 +22,7 @@ def manager():
     Fixture to provide a fresh and clean DataManager instance.
     Ensures that tests start with an empty state.
     """
+    initialize_db()
     data_manager = DataManager()
     data_manager.clear_all_habits()
     return data_manager
@@ -146,3 +151,262 @@ def test_habit_retrieval_by_schedule(manager):
     weekly_habits = manager.get_habits_by_schedule("Weekly")
     assert len(weekly_habits) == 1
     assert weekly_habits[0].name == "Reading"
+
+
+def test_archive_old_events_keeps_counts(manager):
+    """Test that archived events are still counted by streak queries."""
+    habit = Habit(name="Exercise", description="Daily workout", schedule="Daily", created_at="")
+    manager.add_habit(habit)
+
+    start = manager.changes_since(0)[-1].seq
+    today = date.today()
+    for days_ago in (0, 3, 400, 401, 401, 800):
+        manager.log_event("Exercise", (today - timedelta(days=days_ago)).isoformat())
+
+    archived = manager.archive_old_events(horizon_days=365)
+    assert archived == 4
+    assert [c.payload["date"] for c in manager.changes_since(start) if c.operation == "log_event"] == [
+        today.isoformat(), (today - timedelta(days=3)).isoformat()
+    ]
+
+    assert manager.calculate_all_time_streak("Exercise") == 5
+    assert manager.calculate_streak("Exercise", "weekly") == 2
+
+    # Archiving again merges into the existing archive without losing days
+    manager.log_event("Exercise", (today - timedelta(days=500)).isoformat())
+    manager.archive_old_events(horizon_days=2)
+    assert manager.calculate_all_time_streak("Exercise") == 6
+    assert manager.calculate_streak("Exercise", "weekly") == 2
+    assert manager.calculate_streak("Exercise", "daily") == 1
+
+
+def test_delete_habit_removes_archive(manager):
+    """Test that deleting a habit also removes its archived events."""
+    habit = Habit(name="Exercise", description="Daily workout", schedule="Daily", created_at="")
+    manager.add_habit(habit)
+    manager.log_event("Exercise", (date.today() - timedelta(days=400)).isoformat())
+    manager.archive_old_events()
+
+    manager.delete_habit("Exercise")
+    assert manager.calculate_all_time_streak("Exercise") == 0
+
+
+def test_progress_sums_quantities_per_period(manager):
+    """Test that progress sums event quantities per period against the target."""
+    habit = Habit(name="Water", description="Drink water", schedule="Daily", created_at="", target=8)
+    manager.add_habit(habit)
+
+    manager.log_event("Water", "2024-03-01", 3)
+    manager.log_event("Water", "2024-03-01", 5)
+    manager.log_event("Water", "2024-03-02", 2)
+
+    assert manager.get_progress("Water") == [("2024-03-01", 8, 8), ("2024-03-02", 2, 8)]
+    assert manager.get_progress("Water", "monthly") == [("2024-03", 10, 8)]
+    assert manager.calculate_all_time_streak("Water") == 2
+
+    with pytest.raises(ValueError):
+        manager.log_event("Water", "2024-03-03", 0)
+
+
+def test_archive_keeps_quantities(manager):
+    """Test that archived days keep their quantities so progress stays exact."""
+    habit = Habit(name="Run", description="Run km", schedule="Weekly", created_at="", target=20)
+    manager.add_habit(habit)
+
+    old = date.today() - timedelta(days=400)
+    manager.log_event("Run", old.isoformat())
+    manager.log_event("Run", (old + timedelta(days=1)).isoformat(), 10)
+
+    assert manager.archive_old_events() == 2
+    assert sum(total for _, total, _ in manager.get_progress("Run", "daily")) == 11
+    assert manager.calculate_all_time_streak("Run") == 2
+
+
+def test_changes_since_records_mutations(manager):
+    """Test that each mutation is appended to the change feed in order."""
+    start = manager.changes_since(0)[-1].seq
+
+    manager.add_habit(Habit(name="Exercise", description="Daily workout", schedule="Daily", created_at=""))
+    manager.log_event("Exercise", "2024-03-01", 2)
+    manager.edit_habit("Exercise", "Workout", "Gym", "Weekly")
+    manager.delete_habit("Workout")
+
+    changes = manager.changes_since(start)
+    assert [c.operation for c in changes] == ["insert", "log_event", "edit", "delete"]
+    assert [c.seq for c in changes] == sorted(c.seq for c in changes)
+    assert changes[1].payload == {"date": "2024-03-01", "quantity": 2}
+    assert changes[2].payload["new_name"] == "Workout"
+    assert manager.changes_since(changes[1].seq, limit=1)[0].operation == "edit"
+
+    # Deleting a habit that does not exist records nothing
+    manager.delete_habit("Nope")
+    assert manager.changes_since(changes[-1].seq) == []
+
+    assert manager.prune_changes(changes[2].seq) >= 2
+    assert [c.operation for c in manager.changes_since(0)] == ["edit", "delete"]
+
+
+def test_dispatcher_batches_and_retries(manager):
+    """Test that the dispatcher delivers in batches and retries failed batches."""
+    start = manager.changes_since(0)[-1].seq
+    manager.add_habit(Habit(name="Water", description="Drink water", schedule="Daily", created_at=""))
+    for day in range(1, 5):
+        manager.log_event("Water", f"2024-03-0{day}")
+
+    batches = []
+    failures = [RuntimeError("not ready")]
+
+    def flaky(changes):
+        if failures:
+            raise failures.pop()
+        batches.append([c.seq for c in changes])
+
+    dispatcher = ChangeDispatcher(batch_size=2)
+    dispatcher.subscribe("mirror", flaky, since_seq=start)
+
+    assert dispatcher.dispatch() == 0
+    assert dispatcher.position("mirror") == start
+    assert dispatcher.dispatch() == 5
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert dispatcher.position("mirror") == batches[-1][-1]
+    assert dispatcher.dispatch() == 0
+
+
+def test_dashboard_summary_tracks_writes(manager):
+    """Test that the dashboard summary follows logged events, backfills and archiving."""
+    today = date.today()
+    manager.add_habit(Habit(name="Exercise", description="Daily workout", schedule="Daily", created_at=""))
+    manager.add_habit(Habit(name="Reading", description="Read a book", schedule="Weekly", created_at=""))
+
+    for days_ago in (0, 1, 2, 5, 400):
+        manager.log_event("Exercise", (today - timedelta(days=days_ago)).isoformat())
+    manager.log_event("Exercise", today.isoformat())
+    manager.archive_old_events()
+
+    exercise, reading = manager.get_dashboard()
+    assert exercise.habit.name == "Exercise"
+    assert exercise.current_streak == 3
+    assert exercise.all_time_count == manager.calculate_all_time_streak("Exercise") == 5
+    assert exercise.last_done == today.isoformat()
+    assert not exercise.due
+    assert reading.current_streak == 0 and reading.all_time_count == 0 and reading.due
+
+    # Backfilling the missing days rebuilds the streak from history
+    for days_ago in (3, 4):
+        manager.log_event("Exercise", (today - timedelta(days=days_ago)).isoformat())
+    assert manager.get_dashboard()[0].current_streak == 6
+
+    # Backfilling into archived history keeps the dashboard in line with the counts
+    old = (today - timedelta(days=400)).isoformat()
+    day_before = (today - timedelta(days=401)).isoformat()
+    for day in (old, day_before, old + "T07:00:00"):
+        manager.log_event("Exercise", day)
+    dashboard = manager.get_dashboard()[0]
+    assert dashboard.all_time_count == manager.calculate_all_time_streak("Exercise") == 8
+
+    manager.edit_habit("Exercise", "Workout", "Gym", "Daily")
+    manager.delete_habit("Reading")
+    assert [s.habit.name for s in manager.get_dashboard()] == ["Workout"]
+
+
+def test_counts_ignore_future_and_rearchived_days(manager):
+    """Test that counts skip future events and count re-logged archived days once."""
+    today = date.today()
+    manager.add_habit(Habit(name="Exercise", description="Daily workout", schedule="Daily", created_at=""))
+
+    manager.log_event("Exercise", (today + timedelta(days=3)).isoformat())
+    assert manager.calculate_streak("Exercise", "daily") == 0
+    assert manager.calculate_streak("Exercise", "weekly") == 0
+
+    old = today - timedelta(days=400)
+    manager.log_event("Exercise", old.isoformat())
+    manager.archive_old_events()
+    manager.log_event("Exercise", old.isoformat())
+    manager.log_event("Exercise", old.isoformat() + "T08:30:00")
+    assert manager.calculate_all_time_streak("Exercise") == 2
+
+
+def test_archive_duplicate_rows_and_large_quantities(manager):
+    """Test that duplicate-row days and quantity days are archived with their totals."""
+    habit = Habit(name="Water", description="Drink water", schedule="Daily", created_at="", target=8)
+    manager.add_habit(habit)
+
+    old = date.today() - timedelta(days=500)
+    for _ in range(8):
+        manager.log_event("Water", old.isoformat())
+    manager.log_event("Water", (old + timedelta(days=1)).isoformat(), 8)
+    manager.log_event("Water", (old + timedelta(days=2)).isoformat(), 2.5)
+
+    assert manager.archive_old_events() == 10
+    assert manager.get_progress("Water") == [
+        (old.isoformat(), 8, 8),
+        ((old + timedelta(days=1)).isoformat(), 8, 8),
+        ((old + timedelta(days=2)).isoformat(), 2.5, 8),
+    ]
+
+    # Logging into an archived day again adds to its stored quantity
+    manager.log_event("Water", old.isoformat(), 1)
+    manager.archive_old_events()
+    assert manager.get_progress("Water")[0] == (old.isoformat(), 9, 8)
+    assert manager.calculate_all_time_streak("Water") == 3
+
+
+def test_weekly_progress_across_new_year(manager):
+    """Test that a Monday-Sunday week crossing New Year is a single period."""
+    habit = Habit(name="Run", description="Run km", schedule="Weekly", created_at="", target=20)
+    manager.add_habit(habit)
+
+    for day in ("2024-12-30", "2024-12-31", "2025-01-01", "2025-01-02"):
+        manager.log_event("Run", day, 5)
+
+    assert manager.get_progress("Run") == [("2024-12-30", 20, 20)]
+
+
+def test_dispatcher_runs_on_background_thread(manager, tmp_path):
+    """Test that run() delivers changes from a thread and survives database errors."""
+    start = manager.changes_since(0)[-1].seq
+    received = []
+    stop = threading.Event()
+
+    dispatcher = ChangeDispatcher()
+    dispatcher.subscribe("mirror", lambda changes: received.extend(c.operation for c in changes), start)
+    broken = ChangeDispatcher(db_name=str(tmp_path / "missing" / "habits.db"))
+    broken.subscribe("mirror", received.extend)
+
+    threads = [
+        threading.Thread(target=d.run, kwargs={"poll_interval": 0.01, "stop_event": stop})
+        for d in (dispatcher, broken)
+    ]
+    for thread in threads:
+        thread.start()
+    manager.add_habit(Habit(name="Exercise", description="Daily workout", schedule="Daily", created_at=""))
+
+    deadline = time.monotonic() + 5
+    while not received and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert received == ["insert"]
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def test_log_event_rejects_invalid_dates(manager):
+    """Test that a rejected date leaves the events, change log and summary untouched."""
+    manager.add_habit(Habit(name="Exercise", description="Daily workout", schedule="Daily", created_at=""))
+    manager.log_event("Exercise", date.today())
+
+    def summary():
+        s = manager.get_dashboard()[0]
+        return s.current_streak, s.all_time_count, s.last_done, s.due
+
+    changes = manager.changes_since(0)
+    before = summary()
+    with pytest.raises(ValueError):
+        manager.log_event("Exercise", "03/01/2024")
+
+    assert not manager.db.in_transaction
+    assert manager.changes_since(0)[-1].seq == changes[-1].seq
+    assert summary() == before == (1, 1, date.today().isoformat(), False)
+    assert manager.db.execute("SELECT COUNT(*) FROM habit_events").fetchone()[0] == 1